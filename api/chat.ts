@@ -5,7 +5,7 @@ const anthropic = new Anthropic({
   apiKey: process.env.CLAUDE_KEY || process.env.ANTHROPIC_API_KEY,
 });
 
-const getSystemPrompt = () => `You are Bolt, an expert AI assistant and exceptional senior software developer with vast knowledge across multiple programming languages, frameworks, and best practices.
+const SYSTEM_PROMPT = `You are Bolt, an expert AI assistant and exceptional senior software developer with vast knowledge across multiple programming languages, frameworks, and best practices.
 
 <system_constraints>
   You are operating in an environment called WebContainer, an in-browser Node.js runtime that emulates a Linux system to some degree. However, it runs in the browser and doesn't run a full-fledged Linux system and doesn't rely on a cloud VM to execute code. All code is executed in the browser. It does come with a shell that emulates zsh. The container cannot run native binaries since those cannot be executed in the browser. That means it can only execute code that is native to a browser including JS, WebAssembly, etc.
@@ -118,24 +118,51 @@ ULTRA IMPORTANT: Do NOT be verbose and DO NOT explain anything unless the user i
 
 ULTRA IMPORTANT: Think first and reply with the artifact that contains all necessary steps to set up the project, files, shell commands to run. It is SUPER IMPORTANT to respond with this first.`;
 
+// The system prompt is identical on every request; mark it cacheable so Anthropic reuses its prefill.
+const CACHED_SYSTEM_PROMPT = [
+  { type: 'text' as const, text: SYSTEM_PROMPT, cache_control: { type: 'ephemeral' as const } },
+];
+
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   if (req.method !== 'POST') {
     return res.status(405).json({ message: 'Method not allowed' });
   }
 
+  const { messages } = req.body ?? {};
+  const validMessages =
+    Array.isArray(messages) &&
+    messages.length > 0 &&
+    messages.every(
+      (message: any) =>
+        (message?.role === 'user' || message?.role === 'assistant') &&
+        typeof message.content === 'string' &&
+        message.content.length > 0,
+    );
+  if (!validMessages) {
+    return res.status(400).json({ message: 'messages must be a non-empty list of user/assistant text messages' });
+  }
+
   try {
-    const { messages } = req.body;
-    
     // Set headers for streaming
     res.setHeader('Content-Type', 'text/event-stream');
     res.setHeader('Cache-Control', 'no-cache');
     res.setHeader('Connection', 'keep-alive');
+    // Send the headers now so the client starts reading before the first token arrives.
+    res.flushHeaders?.();
     
-    const stream = await anthropic.messages.stream({
+    const stream = await anthropic.beta.promptCaching.messages.stream({
       messages: messages,
       model: 'claude-3-5-haiku-20241022',
       max_tokens: 8000,
-      system: getSystemPrompt()
+      system: CACHED_SYSTEM_PROMPT
+    });
+
+    // Stop generating (and paying for) tokens once the client has gone away. This listens on res: req's close
+    // fires as soon as the already-parsed request body is consumed.
+    res.on('close', () => {
+      if (!res.writableEnded) {
+        stream.controller.abort();
+      }
     });
 
     // Stream the response
@@ -148,7 +175,15 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
     res.write('data: [DONE]\n\n');
     res.end();
   } catch (error) {
+    // A client disconnect surfaces as the abort above; it is expected, not a server error.
+    if (error instanceof Anthropic.APIUserAbortError) {
+      return;
+    }
     console.error('Error:', error);
+    if (res.headersSent) {
+      res.end();
+      return;
+    }
     res.status(500).json({ message: 'Internal server error' });
   }
 }
\ No newline at end of file
@@ -1,12 +1,22 @@
 import { VercelRequest, VercelResponse } from '@vercel/node';
 import Anthropic from "@anthropic-ai/sdk";
+import { createHash } from "crypto";
 
 const anthropic = new Anthropic({
   apiKey: process.env.CLAUDE_KEY || process.env.ANTHROPIC_API_KEY,
 });
 
+// Debug environment variables (once per cold start, not per request)
+console.log('Environment variables:', {
+  CLAUDE_KEY: process.env.CLAUDE_KEY ? 'SET' : 'NOT SET',
+  ANTHROPIC_API_KEY: process.env.ANTHROPIC_API_KEY ? 'SET' : 'NOT SET',
+  NODE_ENV: process.env.NODE_ENV
+});
+
 const BASE_PROMPT = "For all designs I ask you to make, have them be beautiful, not cookie cutter. Make webpages that are fully featured and worthy for production.\n\nBy default, this template supports JSX syntax with Tailwind CSS classes, React hooks, and Lucide React for icons. Do not install other packages for UI themes, icons, etc unless absolutely necessary or I request them.\n\nUse icons from lucide-react for logos.\n\nUse stock photos from unsplash where appropriate, only valid URLs you know exist. Do not download the images, only link to them in image tags.\n\n";
 
+const TEMPLATE_SYSTEM_PROMPT = "Return either node or react based on what do you think this project should be. Only return a single word either 'node' or 'react'. Do not return anything extra";
+
 const reactBasePrompt = `You are Bolt, an expert AI assistant and exceptional senior software developer with vast knowledge across multiple programming languages, frameworks, and best practices.
 
 <system_constraints>
@@ -120,36 +130,78 @@ ULTRA IMPORTANT: Do NOT be verbose and DO NOT explain anything unless the user i
 
 ULTRA IMPORTANT: Think first and reply with the artifact that contains all necessary steps to set up the project, files, shell commands to run. It is SUPER IMPORTANT to respond with this first.`;
 
+// Interpolated once at load; the ~9 KB base prompt was otherwise re-embedded into a new string on every request.
+const PROJECT_FILES_PROMPT = `Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`;
+
+// Mirrors the classifier cache in be/src/template.ts (hashed normalised prompt, FIFO eviction, in-flight coalescing);
+// warm instances keep this module state between requests.
+const MAX_CLASSIFIER_PROMPT_LENGTH = 2000;
+const MAX_CACHED_TEMPLATES = 500;
+const templateCache = new Map<string, string>();
+const inFlight = new Map<string, Promise<string>>();
+
+async function classifyTemplate(prompt: string): Promise<string> {
+  const key = createHash('sha256').update(prompt.trim().replace(/\s+/g, ' ').toLowerCase()).digest('hex');
+  const cached = templateCache.get(key);
+  if (cached !== undefined) {
+    return cached;
+  }
+
+  const pending = inFlight.get(key);
+  if (pending) {
+    return pending;
+  }
+
+  const request = requestTemplate(key, prompt);
+  inFlight.set(key, request);
+  try {
+    return await request;
+  } finally {
+    inFlight.delete(key);
+  }
+}
+
+async function requestTemplate(key: string, prompt: string): Promise<string> {
+  const response = await anthropic.messages.create({
+    messages: [{
+      role: 'user', 
+      content: prompt
+    }],
+    model: 'claude-3-5-haiku-20241022',
+    max_tokens: 10,
+    system: TEMPLATE_SYSTEM_PROMPT
+  });
+
+  const answer = String((response.content[0] as any).text).trim().toLowerCase(); // react or node
+  if (answer === "react" || answer === "node") {
+    if (templateCache.size >= MAX_CACHED_TEMPLATES) {
+      const oldest = templateCache.keys().next().value;
+      if (oldest !== undefined) {
+        templateCache.delete(oldest);
+      }
+    }
+    templateCache.set(key, answer);
+  }
+  return answer;
+}
+
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   if (req.method !== 'POST') {
     return res.status(405).json({ message: 'Method not allowed' });
   }
 
-  // Debug environment variables
-  console.log('Environment variables:', {
-    CLAUDE_KEY: process.env.CLAUDE_KEY ? 'SET' : 'NOT SET',
-    ANTHROPIC_API_KEY: process.env.ANTHROPIC_API_KEY ? 'SET' : 'NOT SET',
-    NODE_ENV: process.env.NODE_ENV
-  });
-
   try {
-    const { prompt } = req.body;
-    
-    const response = await anthropic.messages.create({
-      messages: [{
-        role: 'user', 
-        content: prompt
-      }],
-      model: 'claude-3-5-haiku-20241022',
-      max_tokens: 200,
-      system: "Return either node or react based on what do you think this project should be. Only return a single word either 'node' or 'react'. Do not return anything extra"
-    });
-
-    const answer = (response.content[0] as any).text; // react or node
+    const { prompt } = req.body ?? {};
+    if (typeof prompt !== 'string' || !prompt.trim()) {
+      res.status(400).json({ message: 'prompt must be a non-empty string' });
+      return;
+    }
+
+    const answer = await classifyTemplate(prompt.slice(0, MAX_CLASSIFIER_PROMPT_LENGTH));
     
     if (answer === "react") {
       res.json({
-        prompts: [BASE_PROMPT, `Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`],
+        prompts: [BASE_PROMPT, PROJECT_FILES_PROMPT],
         uiPrompts: [reactBasePrompt]
       });
       return;
@@ -157,7 +209,7 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
 
     if (answer === "node") {
       res.json({
-        prompts: [`Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`],
+        prompts: [PROJECT_FILES_PROMPT],
         uiPrompts: [reactBasePrompt]
       });
       return;
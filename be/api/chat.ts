@@ -1,39 +1,47 @@
 import { VercelRequest, VercelResponse } from '@vercel/node';
-import Anthropic from '@anthropic-ai/sdk';
-import { getSystemPrompt } from '../src/prompts';
-
-const anthropic = new Anthropic({
-  apiKey: process.env.ANTHROPIC_API_KEY,
-});
-
-const MODEL = 'claude-3-5-sonnet-latest';
+import { APIUserAbortError } from '@anthropic-ai/sdk';
+import { anthropic, isChatMessages, MODEL, withConversationCache } from '../src/anthropic';
+import { CACHED_SYSTEM_PROMPT } from '../src/prompts';
 
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   if (req.method !== 'POST') {
     return res.status(405).json({ message: 'Method not allowed' });
   }
 
-  const { messages } = req.body as { messages: any };
+  const { messages } = req.body ?? {};
+  if (!isChatMessages(messages)) {
+    return res.status(400).json({ message: 'messages must be a non-empty list of user/assistant text messages' });
+  }
 
   res.setHeader('Content-Type', 'text/event-stream; charset=utf-8');
   res.setHeader('Cache-Control', 'no-cache, no-transform');
   res.setHeader('Connection', 'keep-alive');
   res.flushHeaders?.();
 
+  // Listen on res: req's close fires as soon as the already-parsed request body is consumed.
+  let clientGone = false;
+  let abortStream: (() => void) | undefined;
+  res.on('close', () => {
+    if (!res.writableEnded) {
+      clientGone = true;
+      abortStream?.();
+    }
+  });
+
   try {
-    const stream = await anthropic.messages.stream({
-      messages,
+    const stream = await anthropic.beta.promptCaching.messages.stream({
+      messages: withConversationCache(messages),
       model: MODEL,
       max_tokens: 8000,
-      system: getSystemPrompt(),
+      system: CACHED_SYSTEM_PROMPT,
     });
 
-    const abort = () => {
+    abortStream = () => {
       stream.controller.abort();
     };
-
-    req.on('close', abort);
-    req.on('aborted', abort);
+    if (clientGone) {
+      abortStream();
+    }
 
     for await (const event of stream) {
       if (
@@ -46,9 +54,15 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
     }
 
     await stream.finalMessage();
+    if (clientGone) {
+      return;
+    }
     res.write('data: [DONE]\n\n');
     res.end();
   } catch (error) {
+    if (clientGone || error instanceof APIUserAbortError) {
+      return;
+    }
     console.error('Anthropic streaming error:', error);
     if (!res.headersSent) {
       res.status(500).json({ message: 'Internal server error' });
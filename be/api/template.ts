@@ -1,13 +1,6 @@
 import { VercelRequest, VercelResponse } from '@vercel/node';
-import Anthropic from "@anthropic-ai/sdk";
-import { BASE_PROMPT, getSystemPrompt } from "../src/prompts";
-import { ContentBlock, TextBlock } from "@anthropic-ai/sdk/resources";
-import {basePrompt as nodeBasePrompt} from "../src/defaults/node";
-import {basePrompt as reactBasePrompt} from "../src/defaults/react";
-
-const anthropic = new Anthropic({
-  apiKey: process.env.ANTHROPIC_API_KEY,
-});
+import { isPrompt } from "../src/anthropic";
+import { classifyTemplate, getTemplateResponseBody } from "../src/template";
 
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   if (req.method !== 'POST') {
@@ -15,33 +8,17 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
   }
 
   try {
-    const { prompt } = req.body;
-    
-    const response = await anthropic.messages.create({
-      messages: [{
-        role: 'user', 
-        content: prompt
-      }],
-      model: 'claude-3-5-sonnet-latest',
-      max_tokens: 200,
-      system: "Return either node or react based on what do you think this project should be. Only return a single word either 'node' or 'react'. Do not return anything extra"
-    });
-
-    const answer = (response.content[0] as TextBlock).text; // react or node
-    
-    if (answer === "react") {
-      res.json({
-        prompts: [BASE_PROMPT, `Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`],
-        uiPrompts: [reactBasePrompt]
-      });
+    const { prompt } = req.body ?? {};
+    if (!isPrompt(prompt)) {
+      res.status(400).json({ message: 'prompt must be a non-empty string' });
       return;
     }
 
-    if (answer === "node") {
-      res.json({
-        prompts: [`Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`],
-        uiPrompts: [nodeBasePrompt]
-      });
+    const answer = await classifyTemplate(prompt);
+    const body = getTemplateResponseBody(answer);
+    if (body) {
+      res.setHeader('Content-Type', 'application/json; charset=utf-8');
+      res.send(body);
       return;
     }
 
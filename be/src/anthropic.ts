@@ -0,0 +1,61 @@
+import Anthropic from "@anthropic-ai/sdk";
+import { createLimiter } from "./limiter";
+
+// One client per process so the HTTP agent and its keep-alive sockets are shared by every handler.
+export const anthropic = new Anthropic({
+  apiKey: process.env.ANTHROPIC_API_KEY,
+  // The SDK retries 408/409/429/5xx with exponential backoff and jitter; allow a couple more attempts than the default 2.
+  maxRetries: 4,
+});
+
+export const MODEL = "claude-3-5-sonnet-latest";
+
+// Caps in-flight Anthropic chat streams so bursts queue here instead of tripping rate limits.
+export const withAnthropicSlot = createLimiter(Number(process.env.ANTHROPIC_CONCURRENCY) || 5);
+
+// Template classification gets its own pool. Chat streams hold their slot for the whole generation, and a short
+// classifier call stuck behind them would stall every new project.
+export const withTemplateSlot = createLimiter(Number(process.env.ANTHROPIC_TEMPLATE_CONCURRENCY) || 5);
+
+export type ChatMessage = { role: "user" | "assistant"; content: string };
+
+// Checked before any model call so a malformed body costs a 400, not an Anthropic round-trip that fails anyway.
+export const isChatMessages = (value: unknown): value is ChatMessage[] =>
+  Array.isArray(value) &&
+  value.length > 0 &&
+  value.every(
+    (message) =>
+      (message?.role === "user" || message?.role === "assistant") &&
+      typeof message.content === "string" &&
+      message.content.length > 0,
+  );
+
+export const isPrompt = (value: unknown): value is string => typeof value === "string" && value.trim().length > 0;
+
+// The builder opens a conversation with the /template prompts as user messages, then this many messages holding the
+// user's own request. Keep in sync with initialiseWorkspace in frontend builder-root.tsx.
+const USER_REQUEST_MESSAGES = 1;
+
+// Adds two cache breakpoints: one after the template prompts, and one at the end of the conversation.
+// The template prompts are the same for every project on a template, so a first turn can reuse them from cache.
+// The end-of-conversation breakpoint lets the next turn read the history from cache.
+export const withConversationCache = (messages: ChatMessage[]) => {
+  let leadingUserMessages = 0;
+  while (leadingUserMessages < messages.length && messages[leadingUserMessages].role === "user") {
+    leadingUserMessages++;
+  }
+  const templatePromptCount = leadingUserMessages - USER_REQUEST_MESSAGES;
+  const breakpoints = new Set([messages.length - 1]);
+  if (templatePromptCount > 0) {
+    breakpoints.add(templatePromptCount - 1);
+  }
+
+  return messages.map((message, index) =>
+    breakpoints.has(index)
+      ? {
+          role: message.role,
+          content: [{ type: "text" as const, text: message.content, cache_control: { type: "ephemeral" as const } }],
+        }
+      : message,
+  );
+};
@@ -1,89 +1,98 @@
 require("dotenv").config();
 import express from "express";
-import Anthropic from "@anthropic-ai/sdk";
-import { BASE_PROMPT, getSystemPrompt } from "./prompts";
-import { TextBlock } from "@anthropic-ai/sdk/resources";
-import {basePrompt as nodeBasePrompt} from "./defaults/node";
-import {basePrompt as reactBasePrompt} from "./defaults/react";
+import { CACHED_SYSTEM_PROMPT } from "./prompts";
 import cors from "cors";
+import { anthropic, isChatMessages, isPrompt, MODEL, withAnthropicSlot, withConversationCache } from "./anthropic";
+import { classifyTemplate, getTemplateResponseBody } from "./template";
 
-const anthropic = new Anthropic({
-  apiKey: process.env.ANTHROPIC_API_KEY,
-});
 const app = express();
 app.use(cors())
 app.use(express.json())
 
 app.post("/template", async (req, res) => {
     const prompt = req.body.prompt;
-    
-    const response = await anthropic.messages.create({
-        messages: [{
-            role: 'user', content: prompt
-        }],
-        model: 'claude-3-5-sonnet-latest',
-        max_tokens: 200,
-        system: "Return either node or react based on what do you think this project should be. Only return a single word either 'node' or 'react'. Do not return anything extra"
-    })
-
-    const answer = (response.content[0] as TextBlock).text; // react or node
-    if (answer == "react") {
-        res.json({
-            prompts: [BASE_PROMPT, `Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`],
-            uiPrompts: [reactBasePrompt]
-        })
+    if (!isPrompt(prompt)) {
+        res.status(400).json({message: "prompt must be a non-empty string"})
         return;
     }
 
-    if (answer === "node") {
-        res.json({
-            prompts: [`Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${reactBasePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`],
-            uiPrompts: [nodeBasePrompt]
-        })
-        return;
-    }
+    try {
+        const answer = await classifyTemplate(prompt);
+        const body = getTemplateResponseBody(answer);
+        if (body) {
+            res.type("json").send(body);
+            return;
+        }
 
-    res.status(403).json({message: "You cant access this"})
-    return;
+        res.status(403).json({message: "You cant access this"})
+    } catch (error) {
+        console.error('Error:', error);
+        res.status(500).json({ message: 'Internal server error' });
+    }
 
 })
 
 app.post("/chat", async (req, res) => {
+    const messages = req.body.messages;
+    if (!isChatMessages(messages)) {
+        res.status(400).json({ message: "messages must be a non-empty list of user/assistant text messages" });
+        return;
+    }
+
     res.setHeader('Content-Type', 'text/event-stream; charset=utf-8');
     res.setHeader('Cache-Control', 'no-cache, no-transform');
     res.setHeader('Connection', 'keep-alive');
     res.flushHeaders?.();
 
+    // Listen before queueing for a slot: a client that leaves while queued must not get a stream opened for it later.
+    let clientGone = false;
+    let abortStream: (() => void) | undefined;
+    res.on('close', () => {
+        clientGone = true;
+        abortStream?.();
+    });
+
     try {
-        const messages = req.body.messages;
-        const stream = await anthropic.messages.stream({
-            messages,
-            model: 'claude-3-5-sonnet-latest',
-            max_tokens: 8000,
-            system: getSystemPrompt(),
-        });
+        await withAnthropicSlot(async () => {
+            if (clientGone) {
+                return;
+            }
 
-        const abort = () => {
-            stream.controller.abort();
-        };
+            const stream = await anthropic.beta.promptCaching.messages.stream({
+                messages: withConversationCache(messages),
+                model: MODEL,
+                max_tokens: 8000,
+                system: CACHED_SYSTEM_PROMPT,
+            });
 
-        req.on('close', abort);
-        req.on('aborted', abort);
+            abortStream = () => {
+                stream.controller.abort();
+            };
+            if (clientGone) {
+                abortStream();
+            }
 
-        for await (const event of stream) {
-            if (
-                event.type === 'content_block_delta' &&
-                event.delta.type === 'text_delta' &&
-                event.delta.text
-            ) {
-                res.write(`data: ${JSON.stringify({ text: event.delta.text })}\n\n`);
+            for await (const event of stream) {
+                if (
+                    event.type === 'content_block_delta' &&
+                    event.delta.type === 'text_delta' &&
+                    event.delta.text
+                ) {
+                    res.write(`data: ${JSON.stringify({ text: event.delta.text })}\n\n`);
+                }
             }
-        }
 
-        await stream.finalMessage();
+            await stream.finalMessage();
+        });
+        if (clientGone) {
+            return;
+        }
         res.write('data: [DONE]\n\n');
         res.end();
     } catch (error) {
+        if (clientGone) {
+            return;
+        }
         console.error('Anthropic streaming error:', error);
         if (!res.headersSent) {
             res.status(500).json({ message: 'Internal server error' });
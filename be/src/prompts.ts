@@ -279,6 +279,16 @@ Here are some examples of correct usage of artifacts:
 </examples>
 `;
 
+// Built once at load; the default-cwd prompt is identical on every request.
+export const SYSTEM_PROMPT = getSystemPrompt();
+
+// Same prompt as a cacheable system block, so Anthropic reuses the processed prefix across /chat turns.
+export const CACHED_SYSTEM_PROMPT = [
+  { type: 'text' as const, text: SYSTEM_PROMPT, cache_control: { type: 'ephemeral' as const } },
+];
+
+export const TEMPLATE_SYSTEM_PROMPT = "Return either node or react based on what do you think this project should be. Only return a single word either 'node' or 'react'. Do not return anything extra";
+
 export const CONTINUE_PROMPT = stripIndents`
   Continue your prior response. IMPORTANT: Immediately begin from where you left off without any interruptions.
   Do not repeat any content, including artifact and action tags.
@@ -2,10 +2,7 @@ export function stripIndents(value: string): string;
 export function stripIndents(strings: TemplateStringsArray, ...values: any[]): string;
 export function stripIndents(arg0: string | TemplateStringsArray, ...values: any[]) {
   if (typeof arg0 !== 'string') {
-    const processedString = arg0.reduce((acc, curr, i) => {
-      acc += curr + (values[i] ?? '');
-      return acc;
-    }, '');
+    const processedString = arg0.map((curr, i) => curr + (values[i] ?? '')).join('');
 
     return _stripIndents(processedString);
   }
@@ -0,0 +1,80 @@
+import { createHash } from "crypto";
+import { TextBlock } from "@anthropic-ai/sdk/resources";
+import { anthropic, MODEL, withTemplateSlot } from "./anthropic";
+import { BASE_PROMPT, TEMPLATE_SYSTEM_PROMPT } from "./prompts";
+import {basePrompt as nodeBasePrompt} from "./defaults/node";
+import {basePrompt as reactBasePrompt} from "./defaults/react";
+
+const projectFilesPrompt = (basePrompt: string) => `Here is an artifact that contains all files of the project visible to you.\nConsider the contents of ALL files in the project.\n\n${basePrompt}\n\nHere is a list of files that exist on the file system but are not being shown to you:\n\n  - .gitignore\n  - package-lock.json\n`;
+
+// The /template payloads never change, so build and serialize them once instead of on every request.
+const templateResponseBodies = new Map<string, string>([
+    ["react", JSON.stringify({
+        prompts: [BASE_PROMPT, projectFilesPrompt(reactBasePrompt)],
+        uiPrompts: [reactBasePrompt]
+    })],
+    ["node", JSON.stringify({
+        prompts: [projectFilesPrompt(reactBasePrompt)],
+        uiPrompts: [nodeBasePrompt]
+    })],
+]);
+
+export const getTemplateResponseBody = (answer: string) => templateResponseBodies.get(answer);
+
+const MAX_CACHED_TEMPLATES = 500;
+const templateCache = new Map<string, string>();
+const inFlight = new Map<string, Promise<string>>();
+
+// The opening of a request is plenty to tell node from react; long pasted specs would only add input tokens.
+const MAX_CLASSIFIER_PROMPT_LENGTH = 2000;
+
+// Case and whitespace don't change the node/react decision, so fold them out of the cache key.
+const normalizePrompt = (prompt: string) => prompt.trim().replace(/\s+/g, " ").toLowerCase();
+
+// The node/react pick is a pure function of the prompt, so identical prompts skip the model round-trip.
+export async function classifyTemplate(rawPrompt: string): Promise<string> {
+    const prompt = rawPrompt.slice(0, MAX_CLASSIFIER_PROMPT_LENGTH);
+    const key = createHash("sha256").update(normalizePrompt(prompt)).digest("hex");
+    const cached = templateCache.get(key);
+    if (cached !== undefined) {
+        return cached;
+    }
+
+    // Concurrent requests for the same prompt share one model call.
+    const pending = inFlight.get(key);
+    if (pending) {
+        return pending;
+    }
+
+    const request = requestTemplate(key, prompt);
+    inFlight.set(key, request);
+    try {
+        return await request;
+    } finally {
+        inFlight.delete(key);
+    }
+}
+
+async function requestTemplate(key: string, prompt: string): Promise<string> {
+    const response = await withTemplateSlot(() => anthropic.messages.create({
+        messages: [{
+            role: 'user', content: prompt
+        }],
+        model: MODEL,
+        max_tokens: 10,
+        system: TEMPLATE_SYSTEM_PROMPT
+    }))
+
+    // Cheap trim instead of a stricter parse; stray whitespace or casing shouldn't turn a valid answer into a 403.
+    const answer = (response.content[0] as TextBlock).text.trim().toLowerCase(); // react or node
+    if (answer === "react" || answer === "node") {
+        if (templateCache.size >= MAX_CACHED_TEMPLATES) {
+            const oldest = templateCache.keys().next().value;
+            if (oldest !== undefined) {
+                templateCache.delete(oldest);
+            }
+        }
+        templateCache.set(key, answer);
+    }
+    return answer;
+}
@@ -1,11 +1,13 @@
 'use client';
 
+import dynamic from "next/dynamic";
 import { useRouter } from "next/navigation";
 import axios from "axios";
 import {
   FormEvent,
   useCallback,
   useEffect,
+  useMemo,
   useRef,
   useState,
 } from "react";
@@ -17,10 +19,8 @@ import {
 } from "@/lib/builder/types";
 import { useWebContainer } from "@/hooks/use-webcontainer";
 import { BACKEND_URL } from "@/lib/builder/config";
-import { parseXml } from "@/lib/builder/steps";
 import { StepsList } from "./steps-list";
 import { FileExplorer } from "./file-explorer";
-import { CodeEditor } from "./code-editor";
 import {
   PreviewFrame,
   PreviewStatus,
@@ -30,6 +30,11 @@ import { TabView } from "./tab-view";
 import { Terminal } from "./terminal";
 import { MessageCircle, Bot, User as UserIcon, Sparkles } from "lucide-react";
 
+// Monaco is the heaviest dependency on the page; load it on the client only, after the shell renders.
+const CodeEditor = dynamic(() => import("./code-editor").then((mod) => mod.CodeEditor), {
+  ssr: false,
+});
+
 interface BuilderRootProps {
   prompt: string;
 }
@@ -44,17 +49,37 @@ type IncomingStep = {
   path?: string;
 };
 
+const ARTIFACT_TITLE_REGEX = /<boltArtifact[^>]*title="([^"]*)"/;
+const ACTION_REGEX = /<boltAction\s+type="([^"]*)"(?:\s+filePath="([^"]*)")?>([\s\S]*?)<\/boltAction>/g;
+// Separate instance for summaries: ACTION_REGEX.lastIndex holds the stream scan position.
+const SUMMARY_ACTION_REGEX = new RegExp(ACTION_REGEX.source, 'g');
+const ANSI_COLOR_REGEX = /\x1B\[[0-9;]*m/g;
+const CONFIRM_PROMPT_REGEX = /ok to proceed\?|\(y\/n\)/i;
+// Encoded once and shared by every spawned process that needs auto-confirming.
+const CONFIRM_INPUT = new TextEncoder().encode('y\n');
+
 const summarizeArtifact = (content: string): string => {
   const summaryBits: string[] = [];
 
-  const titleMatch = content.match(/<boltArtifact[^>]*title="([^"]+)"/);
+  const titleMatch = content.match(ARTIFACT_TITLE_REGEX);
   if (titleMatch?.[1]) {
     summaryBits.push(titleMatch[1]);
   }
 
-  const fileMatches = [...content.matchAll(/<boltAction\s+type="file"\s+filePath="([^"]+)"/g)].map(
-    (match) => match[1],
-  );
+  // One pass over the actions collects both file paths and commands.
+  const fileMatches: string[] = [];
+  const commands: string[] = [];
+  for (const [, type, filePath, rawContent] of content.matchAll(SUMMARY_ACTION_REGEX)) {
+    if (type === 'file' && filePath) {
+      fileMatches.push(filePath);
+    } else if (type === 'shell' && commands.length < 2) {
+      const command = rawContent.trim().split('\n')[0];
+      if (command) {
+        commands.push(command);
+      }
+    }
+  }
+
   if (fileMatches.length > 0) {
     const highlighted = fileMatches.slice(0, 3).join(', ');
     summaryBits.push(
@@ -62,15 +87,8 @@ const summarizeArtifact = (content: string): string => {
     );
   }
 
-  const commandMatches = [...content.matchAll(/<boltAction\s+type="shell">([\s\S]*?)<\/boltAction>/g)];
-  if (commandMatches.length > 0) {
-    const commands = commandMatches
-      .map((match) => match[1].trim().split('\n')[0])
-      .filter(Boolean)
-      .slice(0, 2);
-    if (commands.length) {
-      summaryBits.push(`Commands: ${commands.join(', ')}`);
-    }
+  if (commands.length) {
+    summaryBits.push(`Commands: ${commands.join(', ')}`);
   }
 
   return summaryBits.join(' • ');
@@ -100,6 +118,51 @@ const createChatMessage = (role: ChatMessage['role'], content: string): ChatMess
   createdAt: Date.now(),
 });
 
+// npm install alone can emit thousands of lines; older ones are dropped so each log append stays cheap to copy and render.
+const MAX_TERMINAL_LOGS = 500;
+
+// Keeps large artifacts from flooding the WebContainer fs with hundreds of simultaneous writes.
+const MAX_CONCURRENT_FILE_WRITES = 8;
+
+const LEADING_SLASHES_REGEX = /^\/+/;
+
+// Joins a generated file path onto the shell cwd and returns it relative to the workspace root.
+const resolveWorkspacePath = (cwd: string, path: string): string => {
+  const relativePath = path.startsWith('./') ? path.slice(2) : path;
+  const base = cwd.endsWith('/') ? cwd.slice(0, -1) : cwd;
+  return (base ? `${base}/${relativePath}` : relativePath).replace(LEADING_SLASHES_REGEX, '');
+};
+
+// Commands the builder handles itself (dev server, scaffolding) instead of running them in the container.
+const SKIPPED_COMMANDS: { pattern: RegExp; message?: string }[] = [
+  { pattern: /^npm run dev/ },
+  { pattern: /^npm\s+init\b/i, message: 'Skipping `npm init` – scaffold already exists.' },
+  { pattern: /^npm\s+create\b/i, message: 'Skipping `npm create` – scaffold files will be generated by steps.' },
+  {
+    pattern: /^npx\s+tailwindcss\b.*\binit\b/i,
+    message: 'Skipping `npx tailwindcss init` – config files generated by steps.',
+  },
+];
+const NPM_INSTALL_OR_RUN_REGEX = /^npm\s+(install|run)\b/i;
+const NPM_SCAFFOLD_REGEX = /^npm\s+(init|install|create)/;
+
+// Written when npm runs in a folder the artifact never gave a package.json.
+const DEFAULT_PACKAGE_JSON = JSON.stringify(
+  {
+    name: 'appia-project',
+    private: true,
+    version: '0.0.0',
+    type: 'module',
+    scripts: {
+      dev: 'vite',
+      build: 'vite build',
+      preview: 'vite preview',
+    },
+  },
+  null,
+  2,
+);
+
 const sortFileNodes = (nodes: FileItem[]): FileItem[] => {
   return [...nodes].sort((a, b) => {
     if (a.type !== b.type) {
@@ -124,27 +187,61 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
   const [previewStatus, setPreviewStatus] = useState<PreviewStatus>('idle');
   const [autoOpenPreview, setAutoOpenPreview] = useState(true);
   const [workspaceMounted, setWorkspaceMounted] = useState(false);
-  const [hasInitialized, setHasInitialized] = useState(false);
   const [pendingWriteCount, setPendingWriteCount] = useState(0);
   const [chatInput, setChatInput] = useState('');
 
   const chatScrollRef = useRef<HTMLDivElement | null>(null);
   const cwdRef = useRef<string>('');
-  const processedActionKeysRef = useRef<Set<string>>(new Set());
+  // Offset just past the last complete <boltAction> seen in the current stream buffer.
+  const streamScanOffsetRef = useRef(0);
   const artifactStepAddedRef = useRef(false);
   const waitingForWebContainerLogged = useRef(false);
   const runningScriptRef = useRef(false);
   const templateMessagesRef = useRef<ApiMessage[]>([]);
+  // A ref rather than state: StrictMode replays the mount effect before a state update lands, which sent the template and chat requests twice.
+  const initializedRef = useRef(false);
+  // `${type}|${title}|${path}` of every step appended so far, kept alongside `steps` for O(1) dedupe.
+  const stepKeysRef = useRef<Set<string>>(new Set());
+  // mkdir promise per directory, so sibling files (even ones written concurrently) share a single mkdir round-trip.
+  const createdDirectoriesRef = useRef<Map<string, Promise<void>>>(new Map());
+  // package.json paths already confirmed or created, so repeated npm commands skip the fs probe.
+  const knownPackageJsonRef = useRef<Set<string>>(new Set());
+  const pendingLogsRef = useRef<string[]>([]);
+  const logFlushFrameRef = useRef<number | null>(null);
 
   const { instance: webcontainer, error: webcontainerError } = useWebContainer();
 
+  // npm output arrives a line at a time; collect lines and commit them to state at most once per frame.
   const addLog = useCallback((message: string) => {
-    setTerminalLogs((prev) => [
-      ...prev,
-      `[${new Date().toLocaleTimeString()}] ${message}`,
-    ]);
+    const pending = pendingLogsRef.current;
+    pending.push(`[${new Date().toLocaleTimeString()}] ${message}`);
+    if (pending.length > MAX_TERMINAL_LOGS) {
+      pending.splice(0, pending.length - MAX_TERMINAL_LOGS);
+    }
+    if (logFlushFrameRef.current !== null) {
+      return;
+    }
+
+    logFlushFrameRef.current = requestAnimationFrame(() => {
+      logFlushFrameRef.current = null;
+      const lines = pendingLogsRef.current;
+      pendingLogsRef.current = [];
+      // Trim before merging so the full combined array is never materialized; `lines` is already capped.
+      const keep = MAX_TERMINAL_LOGS - lines.length;
+      setTerminalLogs((prev) => (keep > 0 ? prev.slice(-keep).concat(lines) : lines));
+    });
   }, []);
 
+  useEffect(
+    () => () => {
+      if (logFlushFrameRef.current !== null) {
+        cancelAnimationFrame(logFlushFrameRef.current);
+        logFlushFrameRef.current = null;
+      }
+    },
+    [],
+  );
+
   const upsertFile = useCallback((tree: FileItem[], path: string, content: string): FileItem[] => {
     if (!path) {
       return tree;
@@ -217,11 +314,19 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
       const segments = path.split('/').filter(Boolean);
       if (segments.length > 1) {
         const directory = segments.slice(0, -1).join('/');
-        try {
-          await webcontainer.fs.mkdir(directory, { recursive: true });
-        } catch {
-          /* directory exists */
+        let created = createdDirectoriesRef.current.get(directory);
+        if (!created) {
+          created = webcontainer.fs
+            .mkdir(directory, { recursive: true })
+            .then(
+              () => undefined,
+              () => {
+                /* directory exists */
+              },
+            );
+          createdDirectoriesRef.current.set(directory, created);
         }
+        await created;
       }
 
       await webcontainer.fs.writeFile(path, contents);
@@ -237,26 +342,20 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
       }
 
       const packagePath = cwd === '.' ? 'package.json' : `${cwd}/package.json`;
+      if (knownPackageJsonRef.current.has(packagePath)) {
+        return;
+      }
+
       try {
         await webcontainer.fs.readFile(packagePath, 'utf-8');
+        knownPackageJsonRef.current.add(packagePath);
         return;
       } catch {
         // create default package.json
       }
 
-      const defaultPackageJson = {
-        name: 'appia-project',
-        private: true,
-        version: '0.0.0',
-        type: 'module',
-        scripts: {
-          dev: 'vite',
-          build: 'vite build',
-          preview: 'vite preview',
-        },
-      };
-
-      await stageFileForWorkspace(packagePath, JSON.stringify(defaultPackageJson, null, 2));
+      await stageFileForWorkspace(packagePath, DEFAULT_PACKAGE_JSON);
+      knownPackageJsonRef.current.add(packagePath);
       addLog(`Created default package.json at ${packagePath}`);
     },
     [webcontainer, stageFileForWorkspace, addLog],
@@ -268,14 +367,10 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
         return;
       }
 
-      const relativePath = step.path.replace(/^\.\//, '');
-      const cwd = cwdRef.current;
-      const resolvedPath = cwd ? `${cwd.replace(/\/$/, '')}/${relativePath}` : relativePath;
-      const normalizedPath = resolvedPath.replace(/^\/+/, '');
+      const normalizedPath = resolveWorkspacePath(cwdRef.current, step.path);
 
      const content = step.code || '';
      setFiles((prev) => upsertFile(prev, normalizedPath, content));
-     addLog(`Creating file: ${normalizedPath}`);
       setSelectedFile((prev) => {
         if (prev) {
           return prev;
@@ -348,7 +443,6 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
         );
 
         const decoder = new TextDecoder();
-        const encoder = new TextEncoder();
         let writer: WritableStreamDefaultWriter<Uint8Array> | null = null;
 
         (process.output as unknown as ReadableStream<Uint8Array>)
@@ -356,17 +450,17 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
             new WritableStream<Uint8Array>({
               async write(data: Uint8Array) {
                 const raw = decoder.decode(data);
-                const text = raw.replace(/\x1B\[[0-9;]*m/g, '').trim();
+                const text = raw.replace(ANSI_COLOR_REGEX, '').trim();
                 if (text) {
                   addLog(text);
                 }
 
-                if (/ok to proceed\?/i.test(raw) || /\(y\/n\)/i.test(raw) || /\(y\/N\)/i.test(raw)) {
+                if (CONFIRM_PROMPT_REGEX.test(raw)) {
                   addLog('↩ Auto-confirming prompt with "y"');
                   if (!writer) {
                     writer = process.input.getWriter() as unknown as WritableStreamDefaultWriter<Uint8Array>;
                   }
-                  await writer.write(encoder.encode('y\n'));
+                  await writer.write(CONFIRM_INPUT);
                 }
               },
             }),
@@ -383,68 +477,69 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
         addLog('✓ Command completed successfully');
       };
 
-      for (const command of commands) {
-        if (command.startsWith('cd ')) {
-          const target = command.replace(/^cd\s+/, '').trim();
-          changeDirectory(target);
-          continue;
-        }
-
-        if (command.startsWith('npm run dev')) {
-          continue;
-        }
-
-        if (/^npm\s+init\b/i.test(command)) {
-          addLog('Skipping `npm init` – scaffold already exists.');
-          continue;
-        }
-
-        if (/^npm\s+create\b/i.test(command)) {
-          addLog('Skipping `npm create` – scaffold files will be generated by steps.');
-          continue;
-        }
+      try {
+        for (const command of commands) {
+          if (command.startsWith('cd ')) {
+            const target = command.replace(/^cd\s+/, '').trim();
+            changeDirectory(target);
+            continue;
+          }
 
-        if (/^npx\s+tailwindcss\b.*\binit\b/i.test(command)) {
-          addLog('Skipping `npx tailwindcss init` – config files generated by steps.');
-          continue;
-        }
+          const skipRule = SKIPPED_COMMANDS.find(({ pattern }) => pattern.test(command));
+          if (skipRule) {
+            if (skipRule.message) {
+              addLog(skipRule.message);
+            }
+            continue;
+          }
 
-        if (/^npm\s+(install|run)\b/i.test(command)) {
-          await ensurePackageJson(getCwd());
-        }
+          if (NPM_INSTALL_OR_RUN_REGEX.test(command)) {
+            await ensurePackageJson(getCwd());
+          }
 
-        const parts = command.split(/\s+/);
-        const program = parts[0];
-        const args = parts.slice(1);
+          const parts = command.split(/\s+/);
+          const program = parts[0];
+          const args = parts.slice(1);
 
-        if (program === 'npm' && args[0] === 'create') {
-          const hasYesFlag = args.includes('--yes') || args.includes('-y');
-          if (!hasYesFlag) {
-            args.splice(1, 0, '--yes');
+          if (program === 'npm' && args[0] === 'create') {
+            const hasYesFlag = args.includes('--yes') || args.includes('-y');
+            if (!hasYesFlag) {
+              args.splice(1, 0, '--yes');
+            }
           }
-        }
 
-        await execute(program, args);
-
-        if (/^npm\s+(init|install|create)/.test(command)) {
-          const cwd = getCwd();
-          const packagePathRaw = cwd === '.' ? 'package.json' : `${cwd}/package.json`;
-          const packagePath = packagePathRaw.replace(/^\.\//, '');
-          try {
-            const packageJson = await webcontainer.fs.readFile(packagePath, 'utf-8');
-            setFiles((prev) => upsertFile(prev, packagePath, packageJson));
-          } catch (error) {
-            console.warn('[Builder] package.json not accessible after command', command, error);
+          await execute(program, args);
+          // Anything other than npm install/run may have removed or replaced a package.json; re-check next time.
+          if (!NPM_INSTALL_OR_RUN_REGEX.test(command)) {
+            knownPackageJsonRef.current.clear();
           }
-          const lockPathRaw = packagePath.replace(/package\.json$/, 'package-lock.json');
-          const lockPath = lockPathRaw.replace(/^\.\//, '');
-          try {
-            const packageLock = await webcontainer.fs.readFile(lockPath, 'utf-8');
-            setFiles((prev) => upsertFile(prev, lockPath, packageLock));
-          } catch {
-            /* ignore missing lock file */
+
+          if (NPM_SCAFFOLD_REGEX.test(command)) {
+            const cwd = getCwd();
+            // getCwd() is built from clean segments, so these paths never need ./ stripping.
+            const packagePath = cwd === '.' ? 'package.json' : `${cwd}/package.json`;
+            const lockPath = cwd === '.' ? 'package-lock.json' : `${cwd}/package-lock.json`;
+            // The manifest and lock file are independent reads; fetch them together.
+            await Promise.all([
+              webcontainer.fs
+                .readFile(packagePath, 'utf-8')
+                .then((packageJson) => setFiles((prev) => upsertFile(prev, packagePath, packageJson)))
+                .catch((error) => {
+                  console.warn('[Builder] package.json not accessible after command', command, error);
+                }),
+              webcontainer.fs
+                .readFile(lockPath, 'utf-8')
+                .then((packageLock) => setFiles((prev) => upsertFile(prev, lockPath, packageLock)))
+                .catch(() => {
+                  /* ignore missing lock file */
+                }),
+            ]);
           }
         }
+      } finally {
+        // Commands can delete or re-scaffold directories (rm -rf, npm create), so forget which ones exist.
+        createdDirectoriesRef.current.clear();
+        knownPackageJsonRef.current.clear();
       }
 
       const finalCwd = getCwd();
@@ -455,25 +550,24 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
 
   const appendSteps = useCallback(
     (incoming: IncomingStep[]) => {
-      if (!incoming.length) {
+      const additions = incoming.filter((entry) => {
+        const key = `${entry.type}|${entry.title}|${entry.path ?? ''}`;
+        if (stepKeysRef.current.has(key)) {
+          return false;
+        }
+        stepKeysRef.current.add(key);
+        return true;
+      });
+
+      if (!additions.length) {
         return;
       }
 
-      let fileStepsAdded = 0;
       setSteps((prev) => {
-        const existingKeys = new Set(
-          prev.map((step) => `${step.type}|${step.title}|${step.path ?? ''}`),
-        );
-
         let nextId = prev.length ? prev[prev.length - 1].id + 1 : 1;
-        const additions: Step[] = [];
-
-        for (const entry of incoming) {
-          const key = `${entry.type}|${entry.title}|${entry.path ?? ''}`;
-          if (existingKeys.has(key)) {
-            continue;
-          }
-          additions.push({
+        const nextSteps = [
+          ...prev,
+          ...additions.map((entry): Step => ({
             id: nextId++,
             title: entry.title,
             description: entry.description ?? '',
@@ -481,21 +575,13 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
             status: 'pending',
             code: entry.code,
             path: entry.path,
-          });
-          if (entry.type === StepType.CreateFile) {
-            fileStepsAdded += 1;
-          }
-          existingKeys.add(key);
-        }
-
-        if (!additions.length) {
-          return prev;
-        }
-
-        const nextSteps = [...prev, ...additions];
+          })),
+        ];
         setCurrentStep((existing) => existing ?? nextSteps[0]?.id ?? null);
         return nextSteps;
       });
+
+      const fileStepsAdded = additions.filter((entry) => entry.type === StepType.CreateFile).length;
       if (fileStepsAdded > 0) {
         setPendingWriteCount((count) => count + fileStepsAdded);
       }
@@ -506,7 +592,7 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
   const handleStreamBuffer = useCallback(
     (buffer: string) => {
       if (!artifactStepAddedRef.current) {
-        const titleMatch = buffer.match(/<boltArtifact[^>]*title="([^"]*)"/);
+        const titleMatch = buffer.match(ARTIFACT_TITLE_REGEX);
         if (titleMatch) {
           artifactStepAddedRef.current = true;
           appendSteps([
@@ -519,16 +605,18 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
         }
       }
 
-      const actionRegex = /<boltAction\s+type="([^\"]*)"(?:\s+filePath="([^\"]*)")?>([\s\S]*?)<\/boltAction>/g;
+      // Most reads land mid-action; only run the regex once a new closing tag has arrived.
+      if (buffer.indexOf('</boltAction>', streamScanOffsetRef.current) === -1) {
+        return;
+      }
+
+      // Resume from the end of the last complete action so each chunk only scans new text.
+      ACTION_REGEX.lastIndex = streamScanOffsetRef.current;
       const newSteps: IncomingStep[] = [];
       let match;
-      while ((match = actionRegex.exec(buffer)) !== null) {
+      while ((match = ACTION_REGEX.exec(buffer)) !== null) {
         const [, type, filePath = '', rawContent] = match;
-        const key = `${match.index}-${type}-${filePath}`;
-        if (processedActionKeysRef.current.has(key)) {
-          continue;
-        }
-        processedActionKeysRef.current.add(key);
+        streamScanOffsetRef.current = ACTION_REGEX.lastIndex;
 
         if (type === 'file') {
           newSteps.push({
@@ -570,14 +658,6 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
         const data = await response.json();
         const text = data.response ?? '';
         handleStreamBuffer(text);
-        const finalSteps = parseXml(text).map((step) => ({
-          title: step.title,
-          description: step.description,
-          type: step.type,
-          code: step.code,
-          path: step.path,
-        }));
-        appendSteps(finalSteps);
         return text;
       }
 
@@ -588,6 +668,8 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
       let fullResponse = '';
+      // Network chunks don't align with SSE lines; carry the trailing partial line into the next read.
+      let pendingLine = '';
 
       while (true) {
         const { done, value } = await reader.read();
@@ -595,8 +677,9 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
           break;
         }
 
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n');
+        const lines = (pendingLine + decoder.decode(value, { stream: true })).split('\n');
+        pendingLine = lines.pop() ?? '';
+        let received = false;
 
         for (const line of lines) {
           if (!line.startsWith('data: ')) {
@@ -611,30 +694,27 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
             const parsed = JSON.parse(data);
             if (parsed.text) {
               fullResponse += parsed.text;
-              handleStreamBuffer(fullResponse);
+              received = true;
             }
           } catch {
             /* ignore malformed chunk */
           }
         }
-      }
 
-      const finalSteps = parseXml(fullResponse).map((step) => ({
-        title: step.title,
-        description: step.description,
-        type: step.type,
-        code: step.code,
-        path: step.path,
-      }));
-      appendSteps(finalSteps);
+        // Parse once per network read rather than once per SSE event.
+        if (received) {
+          handleStreamBuffer(fullResponse);
+        }
+      }
 
+      // handleStreamBuffer has already turned every complete action into a step; a second full parse would only produce duplicates for appendSteps to discard.
       return fullResponse;
     },
-    [appendSteps, handleStreamBuffer],
+    [handleStreamBuffer],
   );
 
   const resetStreamingState = useCallback(() => {
-    processedActionKeysRef.current.clear();
+    streamScanOffsetRef.current = 0;
     artifactStepAddedRef.current = false;
   }, []);
 
@@ -716,11 +796,11 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
   );
 
   useEffect(() => {
-    if (!hasInitialized) {
-      setHasInitialized(true);
+    if (!initializedRef.current) {
+      initializedRef.current = true;
       initialiseWorkspace();
     }
-  }, [hasInitialized, initialiseWorkspace]);
+  }, [initialiseWorkspace]);
 
   useEffect(() => {
     if (!chatScrollRef.current) {
@@ -729,6 +809,12 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
     chatScrollRef.current.scrollTop = chatScrollRef.current.scrollHeight;
   }, [conversation]);
 
+  useEffect(() => {
+    // A new WebContainer instance starts with an empty filesystem.
+    createdDirectoriesRef.current.clear();
+    knownPackageJsonRef.current.clear();
+  }, [webcontainer]);
+
   useEffect(() => {
     if (!webcontainer) {
       return;
@@ -757,6 +843,9 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
     }
 
     const nextStep = pendingSteps[0];
+    const inFlightWrites = steps.filter(
+      (step) => step.type === StepType.CreateFile && step.status === 'in-progress',
+    ).length;
     if (nextStep.type === StepType.CreateFolder) {
       setSteps((prev) =>
         prev.map((step) =>
@@ -772,9 +861,24 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
     }
 
     if (nextStep.type === StepType.CreateFile) {
+      // Files don't depend on each other, so write the contiguous run of pending file steps in parallel,
+      // topping up to the concurrency cap as earlier writes complete.
+      const capacity = MAX_CONCURRENT_FILE_WRITES - inFlightWrites;
+      const fileBatch: Step[] = [];
+      for (const step of pendingSteps) {
+        if (step.type !== StepType.CreateFile || fileBatch.length >= capacity) {
+          break;
+        }
+        fileBatch.push(step);
+      }
+      if (!fileBatch.length) {
+        return;
+      }
+      const batchIds = new Set(fileBatch.map((step) => step.id));
+
       setSteps((prev) =>
         prev.map((step) =>
-          step.id === nextStep.id
+          batchIds.has(step.id)
             ? {
                 ...step,
                 status: 'in-progress',
@@ -782,29 +886,21 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
             : step,
         ),
       );
-      (async () => {
-        try {
-          await addFileStepResult(nextStep);
-          setSteps((prev) =>
-            prev.map((step) =>
-              step.id === nextStep.id
-                ? {
-                    ...step,
-                    status: 'completed',
-                  }
-                : step,
-            ),
-          );
-        } catch (error) {
-          console.error('Failed to process file step:', error);
-          addLog(
-            `ERROR: Failed to create ${nextStep.path ?? 'file'} - ${
-              error instanceof Error ? error.message : 'Unknown error'
-            }`,
-          );
+      for (const fileStep of fileBatch) {
+        (async () => {
+          try {
+            await addFileStepResult(fileStep);
+          } catch (error) {
+            console.error('Failed to process file step:', error);
+            addLog(
+              `ERROR: Failed to create ${fileStep.path ?? 'file'} - ${
+                error instanceof Error ? error.message : 'Unknown error'
+              }`,
+            );
+          }
           setSteps((prev) =>
             prev.map((step) =>
-              step.id === nextStep.id
+              step.id === fileStep.id
                 ? {
                     ...step,
                     status: 'completed',
@@ -812,12 +908,17 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
                 : step,
             ),
           );
-        }
-      })();
+        })();
+      }
       return;
     }
 
     if (nextStep.type === StepType.RunScript) {
+      // Commands may rely on files from earlier steps; wait for in-flight writes to land.
+      if (inFlightWrites > 0) {
+        return;
+      }
+
       if (!workspaceMounted || webcontainerError) {
         if (!waitingForWebContainerLogged.current) {
           addLog('⏳ Waiting for WebContainer before executing shell commands...');
@@ -880,6 +981,17 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
 
   const hasPendingSteps = steps.some((step) => step.status !== 'completed');
 
+  // Summaries only depend on message content, so avoid re-running the artifact regexes on every log/step render.
+  const assistantSummaries = useMemo(() => {
+    const summaries = new Map<string, string>();
+    for (const message of conversation) {
+      if (message.role === 'assistant') {
+        summaries.set(message.id, formatAssistantSummary(message.content));
+      }
+    }
+    return summaries;
+  }, [conversation]);
+
   return (
     <div className="flex min-h-[calc(100vh-64px)] flex-col gap-6">
       <div className="flex items-center justify-between rounded-2xl border bg-card px-6 py-4 shadow">
@@ -931,7 +1043,7 @@ export function BuilderRoot({ prompt }: BuilderRootProps) {
                     {(() => {
                       const displayContent =
                         message.role === 'assistant'
-                          ? formatAssistantSummary(message.content)
+                          ? assistantSummaries.get(message.id) ?? ''
                           : message.content;
                       const timestamp = new Date(message.createdAt).toLocaleTimeString();
                       return (
@@ -24,6 +24,11 @@ export const PREVIEW_STATUS_LABELS: Record<PreviewStatus, string> = {
   error: 'Preview unavailable',
 };
 
+const PREFERRED_SCRIPTS = ['dev', 'start', 'preview'];
+// Dev servers that bind to localhost by default and need explicit host/port flags to be reachable from the preview.
+const HOST_ARG_SERVERS_REGEX = /vite|next|svelte-kit/i;
+const DEV_SERVER_HOST_ARGS = ['--host', '0.0.0.0', '--port', '5173'];
+
 export function PreviewFrame({ files, webContainer, isReady, onStatusChange, onLog }: PreviewFrameProps) {
   const [url, setUrl] = useState<string | null>(null);
   const [status, setStatus] = useState<PreviewStatus>('idle');
@@ -106,16 +111,11 @@ export function PreviewFrame({ files, webContainer, isReady, onStatusChange, onL
         /* ignore parse error, handled below */
       }
 
-      const scripts =
-        packageJson &&
-        typeof packageJson === 'object' &&
-        packageJson !== null &&
-        typeof (packageJson as { scripts?: unknown }).scripts === 'object'
-          ? ((packageJson as { scripts?: Record<string, string> }).scripts ?? {})
-          : {};
+      // One shape check up front; everything below reads plain strings from `scripts`.
+      const rawScripts = (packageJson as { scripts?: unknown } | null)?.scripts;
+      const scripts = (rawScripts && typeof rawScripts === 'object' ? rawScripts : {}) as Record<string, unknown>;
 
-      const preferredScripts = ['dev', 'start', 'preview'];
-      const selectedScript = preferredScripts.find((name) => typeof scripts?.[name] === 'string') ?? null;
+      const selectedScript = PREFERRED_SCRIPTS.find((name) => typeof scripts[name] === 'string') ?? null;
 
       if (!selectedScript) {
         setStatus('error');
@@ -123,9 +123,8 @@ export function PreviewFrame({ files, webContainer, isReady, onStatusChange, onL
         return;
       }
 
-      const scriptCommand = scripts?.[selectedScript] ?? '';
-      const needsHostArgs =
-        selectedScript === 'dev' && typeof scriptCommand === 'string' && /vite|next|svelte-kit/i.test(scriptCommand);
+      const scriptCommand = scripts[selectedScript] as string;
+      const needsHostArgs = selectedScript === 'dev' && HOST_ARG_SERVERS_REGEX.test(scriptCommand);
 
       setStatus('installing');
       setError(null);
@@ -152,9 +151,7 @@ export function PreviewFrame({ files, webContainer, isReady, onStatusChange, onL
         }
 
         setStatus('starting');
-        const runArgs = needsHostArgs
-          ? ['run', selectedScript, '--', '--host', '0.0.0.0', '--port', '5173']
-          : ['run', selectedScript];
+        const runArgs = needsHostArgs ? ['run', selectedScript, '--', ...DEV_SERVER_HOST_ARGS] : ['run', selectedScript];
 
         devProcess = await webContainer.spawn(
           'npm',